@@ -1,4 +1,19 @@
-bind = "0.0.0.0:10000"
-workers = 4
-threads = 2
-timeout = 120
\ No newline at end of file
+import multiprocessing
+import os
+
+
+def default_workers():
+    """2 * usable CPUs + 1; sched_getaffinity respects CPU pinning, cpu_count is the fallback"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        cpus = multiprocessing.cpu_count()
+    return cpus * 2 + 1
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+worker_class = "gevent"                          # Async workers overlap DB and network waits
+# Each worker holds its own quote snapshot and DB pool; set WEB_CONCURRENCY on small instances
+workers = int(os.getenv("WEB_CONCURRENCY") or default_workers())
+worker_connections = 1000                        # Max concurrent greenlets per worker
+timeout = 120
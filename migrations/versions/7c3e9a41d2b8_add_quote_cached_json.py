@@ -0,0 +1,43 @@
+"""Add pre-serialized cached_json column to quotes
+
+Revision ID: 7c3e9a41d2b8
+Revises: 019e6b12a088
+Create Date: 2026-10-15 10:12:31.482915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import orjson
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a41d2b8'
+down_revision = '019e6b12a088'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('quotes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('cached_json', sa.LargeBinary(), nullable=True))
+
+    # Backfill existing rows in the same format the app writes
+    quotes = sa.table('quotes',
+        sa.column('id', sa.Integer),
+        sa.column('text', sa.Text),
+        sa.column('author', sa.String),
+        sa.column('cached_json', sa.LargeBinary)
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(quotes.c.id, quotes.c.text, quotes.c.author)).all()
+    for row in rows:
+        bind.execute(
+            quotes.update()
+            .where(quotes.c.id == row.id)
+            .values(cached_json=orjson.dumps({"id": row.id, "text": row.text, "author": row.author}))
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('quotes', schema=None) as batch_op:
+        batch_op.drop_column('cached_json')
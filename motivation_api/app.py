@@ -1,18 +1,25 @@
 # ------------------------
 # Import necessary libraries
 # ------------------------
-from flask import Flask, jsonify, request                  # Core Flask components
+from flask import Flask, Response, abort, request          # Core Flask components
 from flask_sqlalchemy import SQLAlchemy                  # ORM for database interactions
+from sqlalchemy import event                             # Engine event hooks
+from sqlalchemy.engine import Engine, make_url           # Connection events and URL parsing
 from flask_migrate import Migrate                        # For handling DB migrations
 from flask_cors import CORS                              # Handle Cross-Origin requests
 from flask_limiter import Limiter                        # Rate limiting
 from flask_limiter.util import get_remote_address        # Helper to get IP for rate limiting
 from dotenv import load_dotenv                           # Load environment variables from .env
+import orjson                                            # Fast C-based JSON serialization
+import sqlite3                                           # Detect SQLite connections for PRAGMA tuning
+import redis                                             # Shared rate-limit storage across workers
 import os                                                # OS operations (fetch env variables)
 import hashlib                                           # For hashing (used in QOTD selection)
-from datetime import datetime                            # Work with dates/times
+import hmac                                              # Constant-time API key comparison
+from datetime import datetime, timezone                  # Work with dates/times
 import random                                            # Random selection of quotes
-from functools import wraps                              # For API key decorator
+import time                                              # Timestamps for the sliding rate-limit window
+from functools import wraps, lru_cache                   # Decorators and page caching
 
 # ------------------------
 # Load environment variables from .env
@@ -29,9 +36,22 @@ app = Flask(__name__)  # Initialize Flask app
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL")  # Database connection string
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False               # Disable modification tracking (performance)
 app.config['SECRET_KEY'] = os.getenv("SECRET_KEY")                 # Secret key for session/security
+ADMIN_API_KEY = (os.getenv("ADMIN_API_KEY") or "").encode()        # Admin key, read once at startup
 database_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quotes.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+# SQLALCHEMY_DATABASE_URI overrides the bundled SQLite file (tests point it at sqlite:///:memory:)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("SQLALCHEMY_DATABASE_URI", f'sqlite:///{database_path}')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    "pool_pre_ping": True,   # Drop dead connections before use
+    "pool_recycle": 1800     # Recycle connections every 30 minutes
+}
+# In-memory SQLite uses a single shared connection (StaticPool), which rejects pool sizing
+database_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+if not (database_url.get_backend_name() == "sqlite" and database_url.database in (None, "", ":memory:")):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+        "pool_size": 20,     # Connections kept open for concurrent requests
+        "max_overflow": 40   # Extra connections allowed under bursts
+    })
 
 
 # ------------------------
@@ -39,6 +59,20 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # ------------------------
 db = SQLAlchemy(app)                                     # Initialize SQLAlchemy ORM
 migrate = Migrate(app, db)                               # Initialize Flask-Migrate for DB migrations
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: WAL lets readers run alongside the writer,
+    synchronous=NORMAL is safe under WAL, and the page cache is raised to 64 MB.
+    """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
 CORS(app, resources={r"/api/*": {"origins": "*"}})      # Enable CORS only for /api/* routes
 '''limiter = Limiter(
     app=app,                                # explicitly assign app
@@ -46,54 +80,168 @@ CORS(app, resources={r"/api/*": {"origins": "*"}})      # Enable CORS only for /
     default_limits=[os.getenv("RATE_LIMIT")]  # e.g., "60 per minute"
 )'''
 
+# Redis makes limits shared across Gunicorn workers; memory:// is per-process and only fit for development
+redis_url = os.getenv("REDIS_URL")
+if not redis_url:
+    app.logger.warning("REDIS_URL is not set; rate limits are tracked per worker process")
+
 limiter = Limiter(
     key_func=get_remote_address,
     app=app,
-    #storage_uri=os.getenv('REDIS_URL', 'memory://'),
-    storage_uri="memory://",
+    storage_uri=redis_url or "memory://",
+    storage_options={"socket_connect_timeout": 0.5, "socket_timeout": 0.5} if redis_url else {},
+    strategy="fixed-window",          # One atomic INCR + EXPIRE round-trip per check
+    in_memory_fallback_enabled=True,  # Keep limiting in memory while Redis is unreachable
+    swallow_errors=True,              # Never fail a request because of limiter storage errors
     default_limits=[os.getenv('RATE_LIMIT', '60/minute')]
 )
 
+# Redis client for the per-route sliding-window limiter (disabled when REDIS_URL is unset)
+redis_client = redis.Redis.from_url(
+    redis_url,
+    socket_connect_timeout=0.5,
+    socket_timeout=0.5
+) if redis_url else None
+
 
 # ------------------------
 # Import database models
 # ------------------------
 # Use relative import to avoid circular import issues
-from .models import Quote  # Import Quote model from models.py
+from .models import Quote, quote_json, bulk_insert_quotes  # Import Quote model from models.py
+
+# Read endpoints select only the id and pre-serialized JSON, getting plain rows instead of ORM objects
+quote_columns = db.select(Quote.id, Quote.cached_json)
 
 # ------------------------
 # Helper Functions
 # ------------------------
-def standard_response(success, data=None, message=None):
+API_VERSION = "v1"  # Reported in every response's meta
+
+# (unix second, formatted UTC timestamp); replaced as a whole so concurrent readers see a matching pair
+_timestamp_cache = (0, "")
+
+def current_timestamp():
+    """
+    Returns the current UTC time as an ISO-8601 string with second resolution.
+    Formatting happens at most once per second; other calls reuse the cached string.
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache = (now, datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"))
+    return _timestamp_cache[1]
+
+def standard_response(success, data=None, message=None, meta=None):
     """
     Standardize API JSON responses.
     Includes a success flag, data payload, message, and meta information.
+    Extra meta fields (e.g. pagination cursors) can be passed via `meta`.
+    Serialized with orjson.
     """
-    return jsonify({
+    response_meta = {"generated_at": current_timestamp(), "version": API_VERSION}  # UTC, second resolution
+    if meta:
+        response_meta.update(meta)
+    body = orjson.dumps({
         "success": success,
         "data": data,
         "message": message,
-        "meta": {
-            "generated_at": datetime.utcnow().isoformat(),  # Timestamp of response in UTC
-            "version": "v1"                                 # API version
-        }
+        "meta": response_meta
     })
+    return Response(body, mimetype="application/json")
+
+# Dedicated generator for quote picks and rate-limit ids, independent of any reseeding of the global one
+rng = random.Random()
+
+# Seconds cached quote data may be served; bounds staleness on workers that did not see a write
+CACHE_TTL = 60
+
+# In-memory copy of the whole (small) quotes table, serving /quote and /qotd without DB reads.
+# (quotes, loaded_at); replaced as a whole so concurrent readers never see a half-updated cache
+_quotes_snapshot = (None, 0.0)
+
+# Quote of the Day as (date, snapshot it was picked from, quote); valid only for that exact snapshot
+_qotd_cache = (None, None, None)
+
+def quote_blobs(rows):
+    """
+    Returns the JSON bytes of each (id, cached_json) row, serializing rows whose
+    cached_json is still NULL with one extra query. Rows deleted in between are dropped.
+    """
+    missing = [r.id for r in rows if r.cached_json is None]
+    fallback = {}
+    if missing:
+        fallback_rows = db.session.execute(
+            db.select(Quote.id, Quote.text, Quote.author).where(Quote.id.in_(missing))
+        )
+        fallback = {r.id: quote_json(r.id, r.text, r.author) for r in fallback_rows}
+    blobs = (r.cached_json if r.cached_json is not None else fallback.get(r.id) for r in rows)
+    return [blob for blob in blobs if blob is not None]
+
+def get_quotes_snapshot():
+    """
+    Returns every quote as a tuple of orjson.Fragment JSON blobs ordered by id.
+    The table is only read again after an admin write or once CACHE_TTL has passed.
+    """
+    global _quotes_snapshot
+    quotes, loaded_at = _quotes_snapshot
+    now = time.time()
+    if quotes is None or now - loaded_at > CACHE_TTL:
+        rows = db.session.execute(quote_columns.order_by(Quote.id)).all()
+        quotes = tuple(orjson.Fragment(blob) for blob in quote_blobs(rows))
+        _quotes_snapshot = (quotes, now)
+    return quotes
 
 def get_qotd():
     """
     Deterministically selects the Quote of the Day (QOTD) based on the current date.
-    - Fetches all quotes
+    - Returns the cached quote if it was already picked today from the current snapshot
     - Hashes today's date
-    - Uses modulo to pick one quote index
+    - Uses modulo over the snapshot size to pick one quote index
     """
-    quotes = Quote.query.all()
+    global _qotd_cache
+    quotes = get_quotes_snapshot()
     if not quotes:
         return None
 
     today = datetime.utcnow().strftime("%Y-%m-%d")          # Current UTC date as string
-    index = int(hashlib.sha256(today.encode()).hexdigest(), 16) % len(quotes)  # Deterministic index
+    cached_date, cached_quotes, cached_quote = _qotd_cache
+    if cached_date == today and cached_quotes is quotes:
+        return cached_quote
+
+    # 64-bit BLAKE2b digest read as a machine-word int (no hex round-trip or bignum parsing)
+    index = int.from_bytes(hashlib.blake2b(today.encode(), digest_size=8).digest(), "big") % len(quotes)
+    _qotd_cache = (today, quotes, quotes[index])
     return quotes[index]
 
+MAX_PAGE_SIZE = 100  # Upper bound for the limit query parameter
+
+@lru_cache(maxsize=256)
+def fetch_quotes_page(limit, offset, cursor, ttl_bucket):
+    """
+    Returns one page of quotes as pre-serialized JSON bytes, plus the cursor for the next page.
+    - cursor given: keyset pagination (quotes with id > cursor), cost independent of depth
+    - cursor None: classic offset pagination
+    ttl_bucket (current time // CACHE_TTL) only serves to expire old entries.
+    """
+    query = quote_columns.order_by(Quote.id)
+    if cursor is not None:
+        query = query.where(Quote.id > cursor)
+    else:
+        query = query.offset(offset)
+    quotes = db.session.execute(query.limit(limit)).all()
+
+    next_cursor = quotes[-1].id if quotes and len(quotes) == limit else None
+    return b"[" + b",".join(quote_blobs(quotes)) + b"]", next_cursor
+
+def invalidate_quote_cache():
+    """
+    Clears cached quote data. Must be called after any write to the quotes table.
+    """
+    global _quotes_snapshot
+    _quotes_snapshot = (None, 0.0)  # The QOTD cache is tied to the old snapshot and goes stale with it
+    fetch_quotes_page.cache_clear()
+
 # ------------------------
 # API Key Protection for Admin Endpoints
 # ------------------------
@@ -103,12 +251,74 @@ def require_api_key(f):
     """
     @wraps(f)
     def decorated(*args, **kwargs):
-        api_key = request.headers.get("x-api-key")
-        if api_key != os.getenv("ADMIN_API_KEY"):
+        api_key = (request.headers.get("x-api-key") or "").encode()
+        # compare_digest takes the same time wherever the keys differ; an unset key rejects everything
+        if not ADMIN_API_KEY or not hmac.compare_digest(api_key, ADMIN_API_KEY):
             return standard_response(False, message="Unauthorized"), 401
         return f(*args, **kwargs)
     return decorated
 
+# ------------------------
+# Sliding-Window Rate Limiting (Redis + Lua)
+# ------------------------
+# Prunes expired hits, counts the rest and records the new hit in one atomic call.
+# KEYS[1] = sorted set for the client/route, ARGV = now (ms), window (ms), limit, member
+SLIDING_WINDOW_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, tonumber(ARGV[1]) - tonumber(ARGV[2]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+# register_script runs EVALSHA and reloads the script if Redis lost it
+sliding_window_script = redis_client.register_script(SLIDING_WINDOW_LUA) if redis_client else None
+
+# After a Redis error the sliding window is skipped for this many seconds (no reconnect per request)
+REDIS_RETRY_AFTER = 30
+_redis_down_until = 0.0
+
+def sliding_window_available():
+    """
+    True when Redis is configured and not inside the back-off period after a failure.
+    """
+    return sliding_window_script is not None and time.time() >= _redis_down_until
+
+def sliding_window_allows(key, limit, window):
+    """
+    Records a hit for key and returns False once more than `limit` hits
+    fall inside the last `window` seconds.
+    Fails open (returns True) on Redis errors and backs off for REDIS_RETRY_AFTER seconds.
+    """
+    global _redis_down_until
+    now_ms = int(time.time() * 1000)
+    member = f"{now_ms}-{rng.getrandbits(32):08x}"   # Unique per hit within the same millisecond
+    try:
+        return bool(sliding_window_script(keys=[key], args=[now_ms, window * 1000, limit, member]))
+    except redis.RedisError as e:
+        _redis_down_until = time.time() + REDIS_RETRY_AFTER
+        app.logger.warning("Rate limiter Redis unavailable for %ss, using in-memory limits: %s",
+                           REDIS_RETRY_AFTER, e)
+        return True
+
+def sliding_limit(limit, window):
+    """
+    Decorator to rate limit a route to `limit` requests per `window` seconds per IP.
+    Uses the Redis sliding window when available, otherwise an equivalent Flask-Limiter
+    limit. Either way the route-level limit replaces the global default_limits.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if sliding_window_available():
+                key = f"rate:{request.endpoint}:{get_remote_address()}"
+                if not sliding_window_allows(key, limit, window):
+                    abort(429)  # Same JSON body as Flask-Limiter breaches (see rate_limited)
+            return f(*args, **kwargs)
+        return limiter.limit(f"{limit} per {window} second", exempt_when=sliding_window_available)(decorated)
+    return decorator
+
 # ------------------------
 # Routes
 # ------------------------
@@ -130,27 +340,31 @@ def index():
 
 #---
 
+# Static health body, serialized once at import (no timestamp, so load balancer checks skip standard_response)
+HEALTH_BODY = orjson.dumps({"success": True, "data": {"status": "ok"}, "message": None})
+
 @app.route("/health", methods=["GET"])
+@limiter.exempt  # Load balancers poll this constantly; never rate limit it
 def health():
     """
     Health check endpoint
     Returns simple JSON to verify the server is running
     """
-    return standard_response(True, {"status": "ok"})
+    return Response(HEALTH_BODY, mimetype="application/json")
 
 @app.route("/api/v1/quote", methods=["GET"])
-@limiter.limit("10/second")  # Limit to 10 requests per second per IP
+@sliding_limit(10, 1)  # Limit to 10 requests per second per IP
 def random_quote():
     """
-    Returns a random quote from the database
+    Returns a random quote from the in-memory snapshot
     """
-    quote = Quote.query.order_by(db.func.random()).first()  # Randomly select one quote
-    if not quote:
+    quotes = get_quotes_snapshot()
+    if not quotes:
         return standard_response(False, message="No quotes found"), 404
-    return standard_response(True, {"id": quote.id, "text": quote.text, "author": quote.author})
+    return standard_response(True, rng.choice(quotes))
 
 @app.route("/api/v1/qotd", methods=["GET"])
-@limiter.limit("10/second")
+@sliding_limit(10, 1)
 def quote_of_the_day():
     """
     Returns the deterministic Quote of the Day (QOTD)
@@ -158,26 +372,34 @@ def quote_of_the_day():
     quote = get_qotd()
     if not quote:
         return standard_response(False, message="No quotes found"), 404
-    return standard_response(True, {"id": quote.id, "text": quote.text, "author": quote.author})
+    return standard_response(True, quote)
 
 @app.route("/api/v1/quotes", methods=["GET"])
-@limiter.limit("10/second")
+@sliding_limit(10, 1)
 def list_quotes():
     """
     Returns a paginated list of quotes.
     Query Parameters:
-      - limit: number of quotes to return (default=10)
-      - offset: number of quotes to skip (default=0)
+      - limit: number of quotes to return (default=10, clamped to 1..100)
+      - cursor: id of the last quote already seen; returns the quotes after it (preferred)
+      - offset: number of quotes to skip (default=0), used when no cursor is given
+    The cursor for the next page is returned in meta.next_cursor (null on the last page).
     """
     try:
         limit = int(request.args.get("limit", 10))
         offset = int(request.args.get("offset", 0))
+        cursor = request.args.get("cursor")
+        cursor = int(cursor) if cursor is not None else None
     except ValueError:
-        return standard_response(False, message="limit and offset must be integers"), 400
+        return standard_response(False, message="limit, offset and cursor must be integers"), 400
 
-    quotes = Quote.query.offset(offset).limit(limit).all()
-    data = [{"id": q.id, "text": q.text, "author": q.author} for q in quotes]
-    return standard_response(True, data)
+    # Normalize before the cached call so equivalent requests share one cache entry
+    # and arbitrary limit/offset values cannot flood the page cache.
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    offset = 0 if cursor is not None else max(0, offset)
+    page, next_cursor = fetch_quotes_page(limit, offset, cursor, int(time.time() // CACHE_TTL))
+    return standard_response(True, orjson.Fragment(page),  # Embed cached bytes without re-encoding
+                             meta={"next_cursor": next_cursor})
 
 # ------------------------
 # Admin Routes
@@ -196,12 +418,45 @@ def create_quote():
     if not text or not author:
         return standard_response(False, message="text and author are required"), 400
 
-    quote = Quote(text=text, author=author)
-    db.session.add(quote)
-    db.session.commit()
+    with db.session.begin():
+        quote = Quote(text=text, author=author)
+        db.session.add(quote)
+        db.session.flush()  # Assigns the id without a refresh query after commit
+        result = {"id": quote.id, "text": quote.text, "author": quote.author}
+    invalidate_quote_cache()
 
-    return standard_response(True, {"id": quote.id, "text": quote.text, "author": quote.author}), 201
+    return standard_response(True, result), 201
 
+BULK_MAX_QUOTES = 1000  # Keeps one request from holding the write lock for too long
+
+@app.route("/api/v1/quotes/bulk", methods=["POST"])
+@require_api_key
+def bulk_create_quotes():
+    """
+    Admin endpoint: Create many quotes at once
+    Body: {"quotes": [{"text": ..., "author": ...}, ...]}
+    Uses executemany statements instead of one ORM add per quote.
+    """
+    data = request.get_json()
+    items = data.get("quotes") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return standard_response(False, message="quotes must be a non-empty list"), 400
+    if len(items) > BULK_MAX_QUOTES:
+        return standard_response(False, message=f"at most {BULK_MAX_QUOTES} quotes per request"), 400
+
+    rows = []
+    for item in items:
+        if not isinstance(item, dict) \
+                or not isinstance(item.get("text"), str) or not item["text"] \
+                or not isinstance(item.get("author"), str) or not item["author"]:
+            return standard_response(False, message="every quote needs text and author strings"), 400
+        rows.append({"text": item["text"], "author": item["author"]})
+
+    with db.session.begin():
+        bulk_insert_quotes(rows)
+    invalidate_quote_cache()
+
+    return standard_response(True, {"inserted": len(rows)}), 201
 
 @app.route("/api/v1/quotes/<int:quote_id>", methods=["PUT"])
 @require_api_key
@@ -210,20 +465,23 @@ def update_quote(quote_id):
     Admin endpoint: Update an existing quote
     """
     data = request.get_json()
-    quote = Quote.query.get(quote_id)
-    if not quote:
-        return standard_response(False, message="Quote not found"), 404
-
     text = data.get("text")
     author = data.get("author")
 
-    if text:
-        quote.text = text
-    if author:
-        quote.author = author
+    # Lookup and update share one transaction, committed when the block exits
+    with db.session.begin():
+        quote = db.session.get(Quote, quote_id)  # Primary-key lookup, served from the identity map when possible
+        if not quote:
+            return standard_response(False, message="Quote not found"), 404
 
-    db.session.commit()
-    return standard_response(True, {"id": quote.id, "text": quote.text, "author": quote.author})
+        if text:
+            quote.text = text
+        if author:
+            quote.author = author
+        result = {"id": quote.id, "text": quote.text, "author": quote.author}
+
+    invalidate_quote_cache()
+    return standard_response(True, result)
 
 @app.route("/api/v1/quotes/<int:quote_id>", methods=["DELETE"])
 @require_api_key
@@ -231,13 +489,14 @@ def delete_quote(quote_id):
     """
     Admin endpoint: Delete a quote
     """
-    quote = Quote.query.get(quote_id)
-    if not quote:
-        return standard_response(False, message="Quote not found"), 404
+    with db.session.begin():
+        quote = db.session.get(Quote, quote_id)
+        if not quote:
+            return standard_response(False, message="Quote not found"), 404
+        db.session.delete(quote)
 
-    db.session.delete(quote)
-    db.session.commit()
-    return standard_response(True, {"id": quote.id, "message": "Quote deleted"})
+    invalidate_quote_cache()
+    return standard_response(True, {"id": quote_id, "message": "Quote deleted"})
 
 # ------------------------
 # Error Handling
@@ -249,6 +508,13 @@ def not_found(e):
     """
     return standard_response(False, message="Resource not found"), 404
 
+@app.errorhandler(429)
+def rate_limited(e):
+    """
+    Handles 429 errors from both the Redis sliding window and Flask-Limiter
+    """
+    return standard_response(False, message="Rate limit exceeded"), 429
+
 @app.errorhandler(500)
 def server_error(e):
     """
@@ -259,5 +525,6 @@ def server_error(e):
 # ------------------------
 # Run the Flask App
 # ------------------------
+# Development server only; production runs under Gunicorn with gevent workers (gunicorn_config.py)
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=os.getenv("FLASK_ENV") == "development")
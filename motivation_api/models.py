@@ -1,11 +1,57 @@
+import orjson
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import set_committed_value
 from motivation_api.app import db
 
+# Relationship loading convention:
+# Every relationship() must declare lazy="selectin" (or be loaded with
+# .options(selectinload(...)) in the query) so listing N quotes costs one extra
+# query per relationship instead of N. Tests apply raiseload("*") to every ORM
+# query, so an accidental lazy load fails CI. Example for a future tags table:
+#     tags = db.relationship("Tag", secondary=quote_tags, lazy="selectin")
+
 class Quote(db.Model):
     __tablename__ = "quotes"
 
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
     author = db.Column(db.String(255), nullable=False)
+    # Pre-serialized {"id", "text", "author"} JSON, kept in sync on write so reads skip encoding.
+    # May be NULL for rows inserted through raw Core statements; readers fall back to quote_json().
+    # Invariant: ORM flushes refresh it via the hooks below, but Core/bulk writes bypass them, so any
+    # non-ORM UPDATE of text or author must also set cached_json=None (or a fresh quote_json()).
+    cached_json = db.Column(db.LargeBinary, nullable=True)
 
     def __repr__(self):
         return f"<Quote {self.id} - {self.author}>"
+
+def quote_json(id, text, author):
+    """Serialize one quote exactly as the API returns it"""
+    return orjson.dumps({"id": id, "text": text, "author": author})
+
+@event.listens_for(Quote, "after_insert")
+def cache_json_after_insert(mapper, connection, target):
+    """The id only exists after the INSERT, so the blob is written with a follow-up UPDATE"""
+    blob = quote_json(target.id, target.text, target.author)
+    connection.execute(
+        Quote.__table__.update().where(Quote.__table__.c.id == target.id).values(cached_json=blob)
+    )
+    set_committed_value(target, "cached_json", blob)
+
+@event.listens_for(Quote, "before_update")
+def cache_json_before_update(mapper, connection, target):
+    target.cached_json = quote_json(target.id, target.text, target.author)
+
+def bulk_insert_quotes(rows):
+    """
+    Insert many {"text", "author"} dicts with one executemany INSERT ... RETURNING,
+    then fill cached_json with one executemany UPDATE. Returns the number of rows inserted.
+    Like every non-ORM writer it bypasses the flush hooks, so it writes cached_json itself;
+    a later Core db.update(Quote).values(text=...) must likewise reset cached_json to None.
+    """
+    ids = db.session.execute(db.insert(Quote).returning(Quote.id, sort_by_parameter_order=True), rows).scalars().all()
+    db.session.execute(
+        db.update(Quote),
+        [{"id": id, "cached_json": quote_json(id, row["text"], row["author"])} for id, row in zip(ids, rows)]
+    )
+    return len(ids)
@@ -1,5 +1,5 @@
 from motivation_api.app import app, db
-from motivation_api.models import Quote
+from motivation_api.models import Quote, bulk_insert_quotes
 
 quotes_list = [
     {"text": "The best way to get started is to quit talking and begin doing.", "author": "Walt Disney"},
@@ -94,13 +94,12 @@ quotes_list = [
 
 def seed_quotes():
     with app.app_context():  # <-- Push Flask application context
-        for q in quotes_list:
-            # Avoid duplicating quotes if they already exist
-            exists = Quote.query.filter_by(text=q["text"]).first()
-            if not exists:
-                quote = Quote(text=q["text"], author=q["author"])
-                db.session.add(quote)
+        # Avoid duplicating quotes if they already exist (one query for all texts)
+        existing = set(db.session.execute(db.select(Quote.text)).scalars())
+        new_quotes = [q for q in quotes_list if q["text"] not in existing]
+        if new_quotes:
+            bulk_insert_quotes(new_quotes)  # Bulk INSERT, no per-row ORM unit of work
         db.session.commit()
-        print(f"Seeded {len(quotes_list)} quotes successfully!")
+        print(f"Seeded {len(new_quotes)} new quotes successfully!")
 if __name__ == "__main__":
     seed_quotes()
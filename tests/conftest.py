@@ -0,0 +1,116 @@
+import os
+import pytest
+from contextlib import contextmanager
+
+# Must run before the app is imported, since the engine and Redis client are built at import time.
+# Tests use a throwaway in-memory database instead of the tracked motivation_api/quotes.db.
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+# An empty value also stops load_dotenv() from pulling the deployment REDIS_URL out of .env,
+# so tests never wait on an unreachable host
+os.environ["REDIS_URL"] = ""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+import motivation_api.app as app_module
+from motivation_api.app import app, db, limiter, invalidate_quote_cache
+from motivation_api.models import bulk_insert_quotes
+
+# Test configuration
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")  # Loaded from .env when the app is imported
+app.config['TESTING'] = True
+
+@pytest.fixture(autouse=True)
+def no_lazy_loads():
+    """
+    Apply raiseload("*") to every ORM entity query so any relationship that is not
+    eagerly loaded (lazy="selectin" / selectinload) raises instead of issuing N+1 selects.
+    """
+    def apply_raiseload(orm_execute_state):
+        if orm_execute_state.is_select and orm_execute_state.bind_mapper is not None \
+                and not orm_execute_state.is_column_load:
+            orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+    event.listen(Session, "do_orm_execute", apply_raiseload)
+    yield
+    event.remove(Session, "do_orm_execute", apply_raiseload)
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty rate-limit counters and no Redis back-off"""
+    limiter.reset()
+    app_module._redis_down_until = 0.0
+    yield
+
+@pytest.fixture
+def fake_redis_window(monkeypatch):
+    """
+    Run the real sliding-window Lua script against fakeredis (Lua via lupa)
+    instead of the in-memory Flask-Limiter fallback.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeRedis()
+    monkeypatch.setattr(app_module, "sliding_window_script",
+                        server.register_script(app_module.SLIDING_WINDOW_LUA))
+    return server
+
+@pytest.fixture
+def client():
+    """
+    Create test client backed by a fresh database seeded with two quotes.
+    The app context is only pushed for setup and teardown, so each request gets
+    its own context and session (as in production).
+    """
+    with app.app_context():
+        db.create_all()
+        bulk_insert_quotes([
+            {"text": "Test Quote 1", "author": "Author 1"},
+            {"text": "Test Quote 2", "author": "Author 2"},
+        ])
+        db.session.commit()
+    invalidate_quote_cache()  # Drop caches left over from previous tests
+    with app.test_client() as client:
+        yield client
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def headers():
+    """Return headers with admin API key"""
+    return {"x-api-key": ADMIN_API_KEY}
+
+@pytest.fixture
+def many_quotes(client):
+    """Seed 500 extra quotes with bulk statements (no per-row ORM unit of work)"""
+    with app.app_context():
+        bulk_insert_quotes([
+            {"text": f"Bulk Quote {i}", "author": f"Bulk Author {i}"} for i in range(500)
+        ])
+        db.session.commit()
+    invalidate_quote_cache()
+    return 500
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Return a context manager that records every SQL statement sent to the database:
+        with count_queries() as queries:
+            client.get(...)
+        assert len(queries) <= 2
+    """
+    @contextmanager
+    def counter():
+        queries = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield queries
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+    return counter
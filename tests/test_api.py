@@ -1,28 +1,18 @@
 import pytest
-from motivation_api.app import app, db
+import redis
+from collections import namedtuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from motivation_api.app import app, db, invalidate_quote_cache, quote_blobs, BULK_MAX_QUOTES
 from motivation_api.models import Quote
 
 # Add ADMIN_API_KEY constant
 ADMIN_API_KEY = "changeme123"  # Match the key in your .env file
 
-@pytest.fixture
-def client():
-    app.config["TESTING"] = True
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"  # in-memory DB
-    app.config["ADMIN_API_KEY"] = ADMIN_API_KEY  # Set API key for tests
-    with app.test_client() as client:
-        with app.app_context():
-            db.create_all()
-            # Seed test data
-            db.session.add_all([
-                Quote(text="Test Quote 1", author="Author 1"),
-                Quote(text="Test Quote 2", author="Author 2"),
-            ])
-            db.session.commit()
-        yield client
-        # Cleanup
-        with app.app_context():
-            db.drop_all()
+def test_uses_in_memory_database():
+    """The suite must never touch the tracked motivation_api/quotes.db"""
+    with app.app_context():
+        assert db.engine.url.database == ":memory:"
 
 # ------------------------
 # Test health endpoint
@@ -34,6 +24,15 @@ def test_health(client):
     assert json_data["success"] == True
     assert json_data["data"]["status"] == "ok"
 
+def test_health_not_rate_limited(client):
+    for _ in range(70):  # Above the default 60/minute limit
+        assert client.get("/health").status_code == 200
+
+def test_index_meta(client):
+    json_data = client.get("/").get_json()
+    assert json_data["meta"]["version"] == "v1"
+    assert json_data["meta"]["generated_at"].endswith("Z")
+
 # ------------------------
 # Test random quote
 # ------------------------
@@ -45,6 +44,15 @@ def test_random_quote(client):
     assert "text" in json_data["data"]
     assert "author" in json_data["data"]
 
+def test_random_quote_skips_deleted_ids(client):
+    """Random selection must still find a quote when the highest id is deleted"""
+    rv = client.delete("/api/v1/quotes/2", headers={"x-api-key": ADMIN_API_KEY})
+    assert rv.status_code == 200
+    for _ in range(5):
+        rv = client.get("/api/v1/quote")
+        assert rv.status_code == 200
+        assert rv.get_json()["data"]["id"] == 1
+
 # ------------------------
 # Test QOTD deterministic
 # ------------------------
@@ -56,6 +64,14 @@ def test_qotd(client):
     # QOTD should be deterministic
     assert rv1.get_json()["data"]["id"] == rv2.get_json()["data"]["id"]
 
+def test_qotd_cache_invalidated_on_update(client):
+    """An admin update must be visible in the cached QOTD"""
+    headers = {"x-api-key": ADMIN_API_KEY}
+    quote_id = client.get("/api/v1/qotd").get_json()["data"]["id"]
+    client.put(f"/api/v1/quotes/{quote_id}", json={"text": "Edited"}, headers=headers)
+    rv = client.get("/api/v1/qotd")
+    assert rv.get_json()["data"]["text"] == "Edited"
+
 # ------------------------
 # Test list quotes with pagination
 # ------------------------
@@ -65,6 +81,74 @@ def test_list_quotes(client):
     assert rv.status_code == 200
     assert len(json_data["data"]) == 1
 
+# ------------------------
+# Query budgets (guard against N+1 regressions)
+# ------------------------
+def test_list_quotes_query_count(client, count_queries):
+    with count_queries() as queries:
+        rv = client.get("/api/v1/quotes?limit=10")
+    assert rv.status_code == 200
+    assert len(queries) <= 1  # Page select only; blobs come pre-serialized
+
+def test_qotd_query_count(client, count_queries):
+    client.get("/api/v1/qotd")  # Warm up the in-memory snapshot
+    with count_queries() as queries:
+        rv = client.get("/api/v1/qotd")
+    assert rv.status_code == 200
+    assert len(queries) <= 1
+
+def test_entity_queries_get_raiseload(client):
+    """The autouse no_lazy_loads hook really attaches raiseload("*") to ORM entity selects"""
+    options = []
+    def capture(orm_execute_state):  # Registered after the hook, so it sees the rewritten statement
+        options.extend(orm_execute_state.statement._with_options)
+
+    event.listen(Session, "do_orm_execute", capture)
+    try:
+        with app.app_context():
+            db.session.execute(db.select(Quote)).all()
+    finally:
+        event.remove(Session, "do_orm_execute", capture)
+    assert any(("lazy", "raise") in getattr(opt, "strategy", ()) for opt in options)
+
+# ------------------------
+# Test rate limiting
+# ------------------------
+def test_rate_limit_exceeded(client):
+    """Without Redis the Flask-Limiter fallback enforces 10 requests per second"""
+    responses = [client.get("/api/v1/qotd") for _ in range(11)]
+    assert [rv.status_code for rv in responses[:10]] == [200] * 10
+    assert responses[10].status_code == 429
+    assert responses[10].mimetype == "application/json"
+    assert responses[10].get_json()["success"] == False
+    assert responses[10].get_json()["message"] == "Rate limit exceeded"
+
+def test_sliding_window_lua_rejects_11th_hit(client, fake_redis_window):
+    responses = [client.get("/api/v1/quote") for _ in range(11)]
+    assert [rv.status_code for rv in responses[:10]] == [200] * 10
+    assert responses[10].status_code == 429
+    assert responses[10].mimetype == "application/json"
+    assert responses[10].get_json()["message"] == "Rate limit exceeded"
+
+def test_sliding_window_replaces_default_limit(client, fake_redis_window, monkeypatch):
+    """The per-route 10/second limit replaces the global 60/minute default"""
+    clock = iter(range(10**6))
+    monkeypatch.setattr("time.time", lambda: 1_700_000_000 + next(clock) * 0.02)  # Time moves on every call
+    for _ in range(65):
+        assert client.get("/api/v1/qotd").status_code == 200
+
+def test_redis_failure_backs_off(client, monkeypatch):
+    class BrokenScript:
+        calls = 0
+        def __call__(self, keys, args):
+            BrokenScript.calls += 1
+            raise redis.ConnectionError("down")
+
+    monkeypatch.setattr("motivation_api.app.sliding_window_script", BrokenScript())
+    for _ in range(3):
+        assert client.get("/api/v1/quote").status_code == 200
+    assert BrokenScript.calls == 1  # No reconnect attempt per request while backing off
+
 # ------------------------
 # Test error handling
 # ------------------------
@@ -84,11 +168,115 @@ def test_create_quote(client):
     assert rv.status_code == 201
     assert rv.get_json()["success"] == True
 
+def test_list_quotes_cursor(client):
+    rv = client.get("/api/v1/quotes?limit=1")
+    next_cursor = rv.get_json()["meta"]["next_cursor"]
+    assert next_cursor == rv.get_json()["data"][0]["id"]
+
+    rv = client.get(f"/api/v1/quotes?limit=1&cursor={next_cursor}")
+    json_data = rv.get_json()
+    assert rv.status_code == 200
+    assert json_data["data"][0]["id"] > next_cursor
+
+    rv = client.get(f"/api/v1/quotes?limit=1&cursor={json_data['data'][0]['id']}")
+    assert rv.get_json()["data"] == []
+    assert rv.get_json()["meta"]["next_cursor"] is None
+
+def test_list_quotes_cache_invalidated_on_create(client):
+    """Cached pages must include quotes created afterwards"""
+    assert len(client.get("/api/v1/quotes").get_json()["data"]) == 2
+    client.post("/api/v1/quotes",
+                json={"text": "New", "author": "Tester"},
+                headers={"x-api-key": ADMIN_API_KEY})
+    assert len(client.get("/api/v1/quotes").get_json()["data"]) == 3
+
+def test_create_quote_wrong_api_key(client):
+    rv = client.post("/api/v1/quotes",
+                     json={"text": "New", "author": "Tester"},
+                     headers={"x-api-key": "wrong-key"})
+    assert rv.status_code == 401
+    assert rv.get_json()["success"] == False
+
+def test_bulk_create_quotes(client, headers):
+    rv = client.post("/api/v1/quotes/bulk",
+                     json={"quotes": [{"text": f"Bulk {i}", "author": "Tester"} for i in range(3)]},
+                     headers=headers)
+    assert rv.status_code == 201
+    assert rv.get_json()["data"]["inserted"] == 3
+    assert len(client.get("/api/v1/quotes").get_json()["data"]) == 5
+
+def test_bulk_create_quotes_validation(client, headers):
+    rv = client.post("/api/v1/quotes/bulk",
+                     json={"quotes": [{"text": "Missing author"}]},
+                     headers=headers)
+    assert rv.status_code == 400
+
+def test_bulk_create_quotes_rejects_non_strings(client, headers):
+    rv = client.post("/api/v1/quotes/bulk",
+                     json={"quotes": [{"text": ["Not", "a", "string"], "author": "Tester"}]},
+                     headers=headers)
+    assert rv.status_code == 400
+    assert len(client.get("/api/v1/quotes").get_json()["data"]) == 2
+
+def test_bulk_create_quotes_caps_batch_size(client, headers):
+    rv = client.post("/api/v1/quotes/bulk",
+                     json={"quotes": [{"text": "Q", "author": "A"}] * (BULK_MAX_QUOTES + 1)},
+                     headers=headers)
+    assert rv.status_code == 400
+
+def test_list_quotes_deep_cursor(client, many_quotes):
+    rv = client.get("/api/v1/quotes?limit=5&cursor=400")
+    ids = [q["id"] for q in rv.get_json()["data"]]
+    assert ids == [401, 402, 403, 404, 405]
+
+def test_cached_json_tracks_writes(client, headers):
+    """Quotes written through the ORM carry up-to-date pre-serialized JSON"""
+    quote_id = client.post("/api/v1/quotes",
+                           json={"text": "Cached", "author": "Tester"},
+                           headers=headers).get_json()["data"]["id"]
+    client.put(f"/api/v1/quotes/{quote_id}", json={"text": "Recached"}, headers=headers)
+
+    with app.app_context():
+        assert db.session.get(Quote, quote_id).cached_json == (
+            b'{"id":%d,"text":"Recached","author":"Tester"}' % quote_id
+        )
+    rv = client.get(f"/api/v1/quotes?cursor={quote_id - 1}")
+    assert rv.get_json()["data"] == [{"id": quote_id, "text": "Recached", "author": "Tester"}]
+
+def test_rows_without_cached_json_are_serialized(client):
+    """Rows inserted by raw Core statements have no blob and are serialized on read"""
+    with app.app_context():
+        db.session.execute(db.insert(Quote), [{"text": "Raw", "author": "Core"}])
+        db.session.commit()
+    invalidate_quote_cache()
+    rv = client.get("/api/v1/quotes?cursor=2")
+    assert rv.get_json()["data"] == [{"id": 3, "text": "Raw", "author": "Core"}]
+
+def test_core_update_resets_cached_json(client):
+    """Non-ORM updates clear the blob so the fallback re-serializes the new text"""
+    with app.app_context():
+        db.session.execute(db.update(Quote).where(Quote.id == 1).values(text="Edited", cached_json=None))
+        db.session.commit()
+    invalidate_quote_cache()
+    rv = client.get("/api/v1/quotes?limit=1")
+    assert rv.get_json()["data"] == [{"id": 1, "text": "Edited", "author": "Author 1"}]
+
+def test_quote_blobs_drops_deleted_rows(client):
+    """A NULL-blob row deleted before the fallback query is skipped, not a KeyError"""
+    Row = namedtuple("Row", "id cached_json")
+    with app.app_context():
+        assert quote_blobs([Row(1, b"{}"), Row(999, None)]) == [b"{}"]
+
 def test_pagination_validation(client):
     """Test invalid pagination parameters"""
     response = client.get("/api/v1/quotes?limit=invalid")
     assert response.status_code == 400
 
+def test_list_quotes_clamps_limit(client, many_quotes):
+    """Out-of-range limits are clamped instead of creating new page cache entries"""
+    assert len(client.get("/api/v1/quotes?limit=5000").get_json()["data"]) == 100
+    assert len(client.get("/api/v1/quotes?limit=0").get_json()["data"]) == 1
+
 def test_update_quote(client):
     """Test quote update endpoint"""
     # First create a quote
@@ -118,4 +306,10 @@ def test_update_quote(client):
     
     assert update_response.status_code == 200
     assert update_response.json["data"]["text"] == "Updated quote"
-    assert update_response.json["data"]["author"] == "Updated Author"
\ No newline at end of file
+    assert update_response.json["data"]["author"] == "Updated Author"
+
+def test_delete_missing_quote(client):
+    """Deleting an unknown id returns 404 and leaves the table untouched"""
+    rv = client.delete("/api/v1/quotes/999", headers={"x-api-key": ADMIN_API_KEY})
+    assert rv.status_code == 404
+    assert len(client.get("/api/v1/quotes").get_json()["data"]) == 2